@@ -187,6 +187,8 @@ def get_model_stats():
         raise HTTPException(status_code=503, detail="Modèle non entraîné")
     
     feature_importance = scoring_model.get_feature_importance()
+    hot = scoring_model.thresholds['Hot']
+    warm = scoring_model.thresholds['Warm']
     feature_names = [
         'recency_days', 'contact_frequency', 'total_purchase_amount',
         'email_open_rate', 'website_visits', 'customer_age_days', 'rfm_score'
@@ -199,10 +201,11 @@ def get_model_stats():
             name: float(importance) 
             for name, importance in zip(feature_names, feature_importance)
         },
+        "calibration": scoring_model.calibration_method,
         "segments": {
-            "Hot": "Score >= 70",
-            "Warm": "40 <= Score < 70",
-            "Cold": "Score < 40"
+            "Hot": f"Score >= {hot}",
+            "Warm": f"{warm} <= Score < {hot}",
+            "Cold": f"Score < {warm}"
         }
     }
 
@@ -7,22 +7,39 @@ import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report, roc_auc_score
 import joblib
 from datetime import datetime, timedelta
 
+# Taille de la table de calibration: une entrée par pas de 0.001 sur [0, 1]
+CALIBRATION_TABLE_SIZE = 1001
+
+# Seuils historiques des segments (score 0-100)
+DEFAULT_THRESHOLDS = {'Hot': 70, 'Warm': 40}
+
+# Taux de conversion visés par segment
+DEFAULT_TARGET_RATES = {'Hot': 0.70, 'Warm': 0.40}
+
+
 class CRMScoringModel:
     """
     Modèle de scoring intelligent pour CRM SMOFT
     Prédit la probabilité de conversion d'un prospect/client
     """
     
-    def __init__(self):
+    def __init__(self, calibration_method='isotonic'):
         self.model = RandomForestClassifier(
             n_estimators=100,
             max_depth=10,
+            oob_score=True,
             random_state=42
         )
+        self.calibration_method = calibration_method
+        # Table identité tant qu'aucune calibration n'a été apprise
+        self.calibration_table = np.linspace(0, 1, CALIBRATION_TABLE_SIZE)
+        self.thresholds = dict(DEFAULT_THRESHOLDS)
         self.is_trained = False
         
     def create_features(self, df):
@@ -63,18 +80,103 @@ class CRMScoringModel:
         
         return features
     
-    def train(self, X_train, y_train):
+    def train(self, X_train, y_train, target_rates=None):
         """
         Entraînement du modèle de scoring
+        
+        La calibration est apprise sur les probabilités out-of-bag de la
+        forêt, puis les seuils des segments sont fixés à partir des taux
+        de conversion visés (target_rates).
         """
         print("🚀 Entraînement du modèle de scoring CRM...")
         self.model.fit(X_train, y_train)
         self.is_trained = True
         print("✅ Modèle entraîné avec succès!")
         
+        print(f"📐 Calibration des probabilités ({self.calibration_method})...")
+        self.calibrate(y_train, target_rates)
+        print(f"✅ Seuils calibrés: Hot >= {self.thresholds['Hot']}, "
+              f"Warm >= {self.thresholds['Warm']}")
+        
+    def calibrate(self, y_train, target_rates=None):
+        """
+        Calibration des probabilités (isotonic ou Platt)
+        
+        Le calibrateur est compilé en une table de CALIBRATION_TABLE_SIZE
+        entrées: au scoring, la calibration se réduit à un index par ligne.
+        """
+        if not self.is_trained:
+            raise Exception("Le modèle n'est pas encore entraîné!")
+        
+        # Probabilités out-of-bag: non biaisées sans jeu de validation dédié
+        oob_decision = self.model.oob_decision_function_
+        oob_proba = oob_decision[:, 1]
+        y = np.asarray(y_train)
+        
+        # Les rares lignes jamais out-of-bag ont une ligne de zéros: on les écarte
+        mask = oob_decision.sum(axis=1) > 0
+        oob_proba, y = oob_proba[mask], y[mask]
+        
+        grid = np.linspace(0, 1, CALIBRATION_TABLE_SIZE)
+        if self.calibration_method == 'isotonic':
+            calibrator = IsotonicRegression(
+                y_min=0, y_max=1, out_of_bounds='clip'
+            )
+            calibrator.fit(oob_proba, y)
+            table = calibrator.predict(grid)
+        elif self.calibration_method == 'platt':
+            calibrator = LogisticRegression()
+            calibrator.fit(oob_proba.reshape(-1, 1), y)
+            table = calibrator.predict_proba(grid.reshape(-1, 1))[:, 1]
+        else:
+            raise ValueError(
+                f"Méthode de calibration inconnue: {self.calibration_method}"
+            )
+        self.calibration_table = np.clip(table, 0, 1)
+        
+        # Seuils dérivés des taux de conversion visés
+        self.thresholds = self._thresholds_from_rates(
+            target_rates or DEFAULT_TARGET_RATES
+        )
+        
+    def _proba_to_score(self, proba):
+        """
+        Probabilité brute -> score calibré 0-100 via la table de calibration
+        """
+        last = len(self.calibration_table) - 1
+        idx = np.rint(np.asarray(proba) * last).astype(int)
+        calibrated = self.calibration_table[idx]
+        return np.rint(calibrated * 100).astype(int)
+    
+    def _thresholds_from_rates(self, target_rates):
+        """
+        Seuils des segments à partir des taux de conversion visés
+        
+        Le taux visé est marginal: le seuil d'un segment est le plus petit
+        score atteignable par la table de calibration dont la probabilité
+        calibrée atteint ce taux (un score de 70 ~ 70% de conversion).
+        Les seuils sont bornés pour garder 0 < Warm < Hot, de sorte que
+        les trois segments restent atteignables.
+        """
+        table_scores = np.rint(self.calibration_table * 100).astype(int)
+        
+        thresholds = {}
+        for segment in ('Hot', 'Warm'):
+            target_score = int(np.ceil(round(target_rates[segment] * 100, 6)))
+            reachable = table_scores[table_scores >= target_score]
+            if reachable.size:
+                thresholds[segment] = int(reachable.min())
+            else:
+                # Taux inatteignable: seuil historique
+                thresholds[segment] = DEFAULT_THRESHOLDS[segment]
+        
+        thresholds['Hot'] = max(thresholds['Hot'], 2)
+        thresholds['Warm'] = min(max(thresholds['Warm'], 1), thresholds['Hot'] - 1)
+        return thresholds
+        
     def predict_score(self, X):
         """
-        Prédire le score de conversion (0-100)
+        Prédire le score de conversion calibré (0-100)
         """
         if not self.is_trained:
             raise Exception("Le modèle n'est pas encore entraîné!")
@@ -82,23 +184,23 @@ class CRMScoringModel:
         # Probabilité de conversion
         proba = self.model.predict_proba(X)[:, 1]
         
-        # Conversion en score 0-100
-        scores = (proba * 100).astype(int)
+        # Calibration par table puis conversion en score 0-100
+        scores = self._proba_to_score(proba)
         
         return scores
     
     def predict_segment(self, scores):
         """
         Segmentation automatique basée sur le score
-        - Hot (Chaud): score >= 70
-        - Warm (Tiède): 40 <= score < 70
-        - Cold (Froid): score < 40
+        - Hot (Chaud): score >= seuil Hot (70 par défaut)
+        - Warm (Tiède): seuil Warm <= score < seuil Hot (40 par défaut)
+        - Cold (Froid): score < seuil Warm
         """
         segments = []
         for score in scores:
-            if score >= 70:
+            if score >= self.thresholds['Hot']:
                 segments.append('Hot')
-            elif score >= 40:
+            elif score >= self.thresholds['Warm']:
                 segments.append('Warm')
             else:
                 segments.append('Cold')
@@ -116,16 +218,32 @@ class CRMScoringModel:
     
     def save_model(self, filepath='crm_scoring_model.pkl'):
         """
-        Sauvegarder le modèle entraîné
+        Sauvegarder le modèle entraîné avec sa calibration et ses seuils
         """
-        joblib.dump(self.model, filepath)
+        joblib.dump({
+            'model': self.model,
+            'calibration_method': self.calibration_method,
+            'calibration_table': self.calibration_table,
+            'thresholds': self.thresholds,
+        }, filepath)
         print(f"✅ Modèle sauvegardé: {filepath}")
     
     def load_model(self, filepath='crm_scoring_model.pkl'):
         """
         Charger un modèle pré-entraîné
         """
-        self.model = joblib.load(filepath)
+        artifact = joblib.load(filepath)
+        if isinstance(artifact, dict):
+            self.model = artifact['model']
+            self.calibration_method = artifact['calibration_method']
+            self.calibration_table = np.asarray(artifact['calibration_table'])
+            self.thresholds = dict(artifact['thresholds'])
+        else:
+            # Ancien format: forêt seule, sans calibration
+            self.model = artifact
+            self.calibration_method = None
+            self.calibration_table = np.linspace(0, 1, CALIBRATION_TABLE_SIZE)
+            self.thresholds = dict(DEFAULT_THRESHOLDS)
         self.is_trained = True
         print(f"✅ Modèle chargé: {filepath}")
 
@@ -162,6 +280,31 @@ def generate_sample_data(n_samples=1000):
     return df
 
 
+def check_calibration(model):
+    """
+    Vérifications de cohérence de la calibration et des seuils
+    
+    >>> df = generate_sample_data()
+    >>> model = CRMScoringModel()
+    >>> X = model.create_features(df)
+    >>> model.train(X, df['converted'])  # doctest: +ELLIPSIS
+    🚀 ...
+    >>> check_calibration(model)
+    True
+    """
+    table = model.calibration_table
+    assert len(table) == CALIBRATION_TABLE_SIZE
+    assert np.all((table >= 0) & (table <= 1))
+    assert np.all(np.diff(table) >= 0), "Table de calibration non monotone"
+    
+    hot, warm = model.thresholds['Hot'], model.thresholds['Warm']
+    assert 0 < warm < hot <= 100, f"Seuils incohérents: {model.thresholds}"
+    
+    # Scores extrêmes: les trois segments restent atteignables
+    assert model.predict_segment([0, warm, hot]) == ['Cold', 'Warm', 'Hot']
+    return True
+
+
 def demo_scoring_workflow():
     """
     Démonstration complète du workflow de scoring
@@ -194,6 +337,7 @@ def demo_scoring_workflow():
     
     # 4. Entraînement
     model.train(X_train, y_train)
+    check_calibration(model)
     print()
     
     # 5. Prédictions
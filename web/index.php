@@ -427,15 +427,15 @@ $apiStatus = $apiHealth ? 'connected' : 'disconnected';
 
             <div class="features">
                 <div class="feature">
-                    <h3>🔥 Hot Leads (Score ≥ 70)</h3>
+                    <h3 id="segmentHot">🔥 Hot Leads (Score ≥ 70)</h3>
                     <p>Priorité HAUTE - Ces prospects ont un fort potentiel de conversion. Contactez-les immédiatement!</p>
                 </div>
                 <div class="feature">
-                    <h3>⚡ Warm Leads (Score 40-69)</h3>
+                    <h3 id="segmentWarm">⚡ Warm Leads (Score 40-69)</h3>
                     <p>Priorité MOYENNE - Prospects intéressés nécessitant un suivi sous 48h pour maintenir l'engagement.</p>
                 </div>
                 <div class="feature">
-                    <h3>❄️ Cold Leads (Score < 40)</h3>
+                    <h3 id="segmentCold">❄️ Cold Leads (Score < 40)</h3>
                     <p>Priorité BASSE - Automatisez les relances par email pour nourrir progressivement ces leads.</p>
                 </div>
             </div>
@@ -553,6 +553,13 @@ $apiStatus = $apiHealth ? 'connected' : 'disconnected';
 
                 html += '</div>';
                 document.getElementById('modelStats').innerHTML = html;
+
+                // Seuils des segments appris par le modèle
+                if (stats.segments) {
+                    document.getElementById('segmentHot').textContent = `🔥 Hot Leads (${stats.segments.Hot})`;
+                    document.getElementById('segmentWarm').textContent = `⚡ Warm Leads (${stats.segments.Warm})`;
+                    document.getElementById('segmentCold').textContent = `❄️ Cold Leads (${stats.segments.Cold})`;
+                }
             } catch (error) {
                 document.getElementById('modelStats').innerHTML = 
                     '<p style="color: #dc3545; text-align: center;">Erreur de chargement des statistiques</p>';